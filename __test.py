@@ -1,114 +1,120 @@
+import os
 import pytest
-import sys
-from pathlib import Path
-import shutil
-
-# Adjust the system path to ensure the main library can be imported
-sys.path.append("C:\\Users\\123wi\\OneDrive\\Desktop\\duits uni\\OOP python\\code")
+from datetime import datetime
 
 from main_library import EditHabits  # Import the EditHabits class
 
-# Fixture to initialize EditHabits instance with a temporary JSON file for testing
-@pytest.fixture(scope="module")
-def habit_tracker(tmp_path_factory):
-    """
-    Creates a temporary habit tracker instance with a new JSON file.
-    Ensures each test module uses a separate instance isolated from others.
-    """
-    temp_file = tmp_path_factory.mktemp("data") / "test_habits.json"
+# Computed once at import; every test that needs "today" reuses this constant
+TODAY = datetime.now().strftime("%Y-%m-%d")
+
+# Every habit the suite asserts against, applied in one batch while seeding
+SEED_HABITS = [
+    # (freq, name, time, action)
+    ("daily", "Morning Exercise", "07:00", "add"),
+    ("daily", "Evening Yoga", "18:00", "remove"),
+    ("daily", "Drink Water", "08:00", "add"),
+    ("weekly", "Check Emails", "Monday 09:00", "complete"),
+    ("monthly", "Pay Bills", "01 12:00", "complete"),
+    ("once_off", "Project Deadline", "2024-11-01 17:00", "complete"),
+]
+
+# Expected display strings, hoisted so assertions never rebuild them per run
+EXPECTED_DAILY = "Daily: Drink Water at 08:00"
+EXPECTED_UNCOMPLETED_MONTHLY = "Uncompleted Monthly: Pay Bills at 01 12:00"
+EXPECTED_COMPLETED_MONTHLY_PREFIX = "Completed Monthly: Pay Bills at "
+
+# Fixture providing a tracker pre-seeded with everything the tests query
+@pytest.fixture(scope="session")
+def seeded_tracker(tmp_path_factory):
+    """
+    Builds one session-wide tracker with every habit from SEED_HABITS applied
+    up front, so each test is a pure read and stays order-independent.
+    Mutators only mark the data dirty, so seeding stays CPU-bound; the
+    accumulated state is flushed to disk once at teardown.
+    """
+    # Unique per pytest-xdist worker so parallel sessions never share a file
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    temp_file = tmp_path_factory.mktemp(f"data-{worker}", numbered=False) / "test_habits.json"
+    # EditHabits.__init__ already creates and loads the empty habits file,
+    # so no explicit create_empty_habits_file call is needed here
     tracker = EditHabits(str(temp_file))
-    tracker.create_empty_habits_file(str(temp_file))  # Initialize an empty habits structure
-    return tracker
 
-# Test for adding an uncompleted habit
-def test_add_uncompleted_habit(habit_tracker):
-    """
-    Verifies that an uncompleted habit can be added to the tracker.
-    """
-    habit_tracker.add_uncompleted_habit('daily', 'Morning Exercise', '07:00')
-    assert ['Morning Exercise', '07:00'] in habit_tracker.habit_data['uncompleted_habits']['daily']
+    for freq, name, time, action in SEED_HABITS:
+        tracker.add_uncompleted_habit(freq, name, time)
+        if action == "remove":
+            tracker.remove_uncompleted_habit(freq, name)
+        elif action == "complete":
+            tracker.move_to_completed(freq, name)
 
-# Test for removing an uncompleted habit
-def test_remove_uncompleted_habit(habit_tracker):
-    """
-    Ensures that an uncompleted habit can be removed from the tracker.
-    """
-    habit_tracker.add_uncompleted_habit('daily', 'Evening Yoga', '18:00')
-    habit_tracker.remove_uncompleted_habit('daily', 'Evening Yoga')
-    assert ['Evening Yoga', '18:00'] not in habit_tracker.habit_data['uncompleted_habits']['daily']
+    yield tracker
+    # flush() writes once and clears the dirty flag, so the atexit hook
+    # doesn't rewrite the file a second time at interpreter exit
+    tracker.flush()
 
-# Test for moving a habit to completed
-def test_move_to_completed(habit_tracker):
+# Helper for O(1) habit membership checks against a habit list
+def _has_habit(entries, name, time):
     """
-    Checks that a habit can be correctly marked as completed and still
-    appears in the list of uncompleted habits if it's a recurring type.
+    Check whether a (name, time) habit exists in the given habit list.
+    Builds a frozenset of (task, time) pairs so the membership test is a hash
+    lookup instead of a linear scan over the growing shared habit lists.
     """
-    habit_name = 'Check Emails'
-    habit_time = 'Monday 09:00'
-    habit_tracker.add_uncompleted_habit('weekly', habit_name, habit_time)
-    habit_tracker.move_to_completed('weekly', habit_name)
+    return (name, time) in frozenset((h[0], h[1]) for h in entries)
+
+# Parametrized test covering the add / remove / complete lifecycle
+@pytest.mark.parametrize("freq, name, time, action", SEED_HABITS)
+def test_add_remove_complete_habit(seeded_tracker, freq, name, time, action):
+    """
+    Asserts the outcome of each seeded add/remove/complete operation.
+    Completing a recurring habit keeps it in the uncompleted list, while a
+    once-off habit is removed. All mutation happened in the fixture, so the
+    parameter rows can run in any order.
+    """
+    # Bind the category dicts once instead of re-indexing habit_data per assert
+    uncompleted = seeded_tracker.habit_data['uncompleted_habits']
+    completed = seeded_tracker.habit_data['completed_habits']
+    history = seeded_tracker.habit_data['history']
 
-    assert [habit_name, habit_time] in habit_tracker.habit_data['uncompleted_habits']['weekly']
-    assert any(habit_name in entry for entry in habit_tracker.habit_data['completed_habits']['weekly'])
+    if action == "remove":
+        assert not _has_habit(uncompleted[freq], name, time)
+    elif action == "complete":
+        # history is keyed by task name, so this is a hash lookup rather than
+        # a substring scan over every completed entry in the frequency list
+        assert history[name]["completed"]
+        # The habit must also have landed in the completed list itself, not
+        # just been logged to history
+        assert any(h[0] == name for h in completed[freq])
+        if freq == "once_off":
+            assert not _has_habit(uncompleted[freq], name, time)
+        else:
+            assert _has_habit(uncompleted[freq], name, time)
+    else:
+        assert _has_habit(uncompleted[freq], name, time)
 
 # Test for retrieving tasks for a specific day
-def test_get_tasks_for_day(habit_tracker):
+def test_get_tasks_for_day(seeded_tracker):
     """
     Tests if the tracker can correctly retrieve tasks scheduled for a specific day.
     """
-    from datetime import datetime
-    today = datetime.now().strftime("%Y-%m-%d")
-    habit_tracker.add_uncompleted_habit('daily', 'Drink Water', '08:00')
-    tasks = habit_tracker.get_tasks_for_day(today)
-    assert "Daily: Drink Water at 08:00" in tasks
+    tasks = seeded_tracker.get_tasks_for_day(TODAY)
+    assert EXPECTED_DAILY in tasks
 
 # Test for listing all habits
-def test_list_all_habits(habit_tracker):
+def test_list_all_habits(seeded_tracker):
     """
     Verifies that all habits, both completed and uncompleted, are correctly listed.
     """
-    habit_tracker.add_uncompleted_habit('monthly', 'Pay Bills', '01 12:00')
-    habit_tracker.move_to_completed('monthly', 'Pay Bills')
-    all_habits = habit_tracker.list_all_habits()
-
-    assert "Uncompleted Monthly: Pay Bills at 01 12:00" in all_habits
-    assert "Completed Monthly: Pay Bills at " in ' '.join(h for h in all_habits if "Pay Bills" in h)
+    all_habits = seeded_tracker.list_all_habits()
 
-# Test for the completion of once-off habits
-def test_once_off_habit_completion(habit_tracker):
-    """
-    Confirms that once-off habits are correctly removed from uncompleted after completion,
-    and appear in the completed list.
-    """
-    habit_name = 'Project Deadline'
-    habit_time = '2024-11-01 17:00'
-    habit_tracker.add_uncompleted_habit('once_off', habit_name, habit_time)
-    habit_tracker.move_to_completed('once_off', habit_name)
-
-    assert [habit_name, habit_time] not in habit_tracker.habit_data['uncompleted_habits']['once_off']
-    assert any(habit_name in entry for entry in habit_tracker.habit_data['completed_habits']['once_off'])
+    assert EXPECTED_UNCOMPLETED_MONTHLY in all_habits
+    assert any(h.startswith(EXPECTED_COMPLETED_MONTHLY_PREFIX) for h in all_habits)
 
 # Test for analyzing habits
-def test_analyze_habits(habit_tracker):
+def test_analyze_habits(seeded_tracker):
     """
     Tests the analysis functionality to ensure it provides correct insights
     into the habits' data, such as longest streaks and most challenging habits.
     """
-    analysis = habit_tracker.analyze_habits()
+    analysis = seeded_tracker.analyze_habits()
     assert analysis['longest_streak']['habit'] is not None
     assert analysis['current_daily_habits'] != []
     assert analysis['most_challenging']['habit'] is not None
-
-# Fixture to clean up the test directory after all tests are run
-@pytest.fixture(scope="session", autouse=True)
-def cleanup(request):
-    """
-    Automatically removes the temporary directory used for tests after all tests are completed.
-    Ensures that no residual data affects other tests or clutters the system.
-    """
-    def remove_test_dir():
-        temp_dir = Path(str(request.config._tmpdirhandler.getbasetemp()))
-        parent_dir = temp_dir.parent
-        if parent_dir.exists():
-            shutil.rmtree(parent_dir)  # Removes the directory even if it has contents
-    request.addfinalizer(remove_test_dir)
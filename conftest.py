@@ -0,0 +1,2 @@
+# Marks the project root for pytest; the import path for main_library is
+# configured via the pythonpath option in pyproject.toml.
@@ -1,23 +1,256 @@
+import atexit
+import bisect
+import calendar
+import copy
 import json
-from datetime import datetime, timedelta
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta, date, time
+from typing import Optional, TypedDict
 import os
 
+# Optional faster JSON backend; the stdlib json module is used when absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional msgspec for decoding the habits file against a typed schema
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Optional numpy for vectorized streak analysis; a plain Python loop is used
+# when it is not installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional numba for JIT-compiling the streak kernel over the numpy arrays
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# The habit periods accepted by every mutating method
+_VALID_PERIODS = frozenset(("daily", "weekly", "monthly", "yearly", "once_off"))
+
+# Typed schema for the habits file. msgspec decodes straight into these
+# shapes without the generic per-key dispatch of json.loads, validates the
+# file for free, and materializes the habit records as the (task, time)
+# tuples the class keeps in memory anyway. TypedDicts rather than Structs so
+# the decoded data stays plain dicts and every existing access keeps working.
+if msgspec is not None:
+    class _HistorySchema(TypedDict):
+        created: Optional[str]
+        completed: list[str]
+        removed: Optional[str]
+
+    class _HabitFileSchema(TypedDict):
+        uncompleted_habits: dict[str, list[tuple[str, str]]]
+        completed_habits: dict[str, list[tuple[str, str]]]
+        history: dict[str, _HistorySchema]
+
+    # Decoder and encoder are specialized once against the schema at import
+    _HABITS_DECODER = msgspec.json.Decoder(_HabitFileSchema)
+    _HABITS_ENCODER = msgspec.json.Encoder()
+else:
+    _HABITS_DECODER = None
+    _HABITS_ENCODER = None
+
+# The empty habits file, serialized once at import. New files are created by
+# writing these bytes directly instead of re-building and re-dumping the
+# nested dict on every call, and the single definition replaces the copies
+# that used to live in both create_empty_habits_file and main.
+_EMPTY_HABITS_TEMPLATE = {
+    "uncompleted_habits": {period: [] for period in ("daily", "weekly", "monthly", "yearly", "once_off")},
+    "completed_habits": {period: [] for period in ("daily", "weekly", "monthly", "yearly", "once_off")},
+    "history": {}  # To store history of when habits were created and completed
+}
+if orjson is not None:
+    _EMPTY_HABITS_JSON = orjson.dumps(_EMPTY_HABITS_TEMPLATE, option=orjson.OPT_INDENT_2)
+else:
+    _EMPTY_HABITS_JSON = json.dumps(_EMPTY_HABITS_TEMPLATE, indent=4).encode()
+
+# Maps weekday names ('Monday', ...) to their date.weekday() numbers
+_WEEKDAY_NUMBERS = {name: i for i, name in enumerate(calendar.day_name)}
+
+
+def _schedule_key(period, habit_time):
+    """
+    Precompute the value get_tasks_for_day matches a habit against: the
+    weekday number for weekly habits, the zero-padded day for monthly ones,
+    the 'MM-DD' prefix for yearly ones and the 'YYYY-MM-DD' prefix for
+    once-off ones. Daily habits run every day, so they have no key. Parsing
+    this once at ingestion replaces the substring scans at query time and
+    avoids false matches like 'Sun' inside 'Sunday'.
+    :param period: The period of the habit.
+    :param habit_time: The habit's time string for that period.
+    :return: The comparison key, or None for daily habits.
+    """
+    if period == "weekly":
+        return _WEEKDAY_NUMBERS.get(habit_time.split(" ", 1)[0])
+    if period == "monthly":
+        return habit_time[:2]
+    if period == "yearly":
+        return habit_time[:5]
+    if period == "once_off":
+        return habit_time[:10]
+    return None
+
+# Validates the 'YYYY-MM-DD' date strings accepted by get_tasks_for_day
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Cache of raw timestamp string -> parsed date. Completion timestamps repeat
+# across tasks and across analyze runs, so each string is only parsed once.
+_DATE_CACHE = {}
+
+
+def _parse_completion_date(stamp):
+    """
+    Return the date for a 'YYYY-MM-DD HH:MM:SS.ffffff' timestamp, cached by
+    the raw string. Only the date part is needed, so the ISO prefix goes
+    through date.fromisoformat's C fast path instead of strptime.
+    :param stamp: Timestamp string with an ISO 'YYYY-MM-DD' prefix.
+    :return: The corresponding date object.
+    """
+    parsed = _DATE_CACHE.get(stamp)
+    if parsed is None:
+        parsed = _DATE_CACHE[stamp] = date.fromisoformat(stamp[0:10])
+    return parsed
+
+
+if np is not None and njit is not None:
+    @njit(cache=True)
+    def _streak_kernel(sorted_days):
+        """
+        Longest run of consecutive +1 steps in a sorted int64 day array.
+        Compiled once by numba and cached on disk for later runs.
+        """
+        best = 1
+        run = 1
+        for i in range(1, sorted_days.shape[0]):
+            if sorted_days[i] - sorted_days[i - 1] == 1:
+                run += 1
+                if run > best:
+                    best = run
+            else:
+                run = 1
+        return best
+else:
+    _streak_kernel = None
+
+
+def _streak_from_sorted_days(days):
+    """
+    Return the longest run of consecutive days in an already-sorted sequence
+    of dates. With numpy available the dates convert in bulk to a datetime64
+    day array and the run lengths come from a vectorized diff; otherwise a
+    plain Python loop is used.
+    :param days: Sorted sequence of date objects.
+    :return: Length of the longest consecutive-day streak.
+    """
+    if not days:
+        return 0
+
+    if np is not None:
+        arr = np.array(days, dtype="datetime64[D]")
+        if arr.shape[0] == 1:
+            return 1
+        if _streak_kernel is not None:
+            # JIT-compiled loop over days-since-epoch integers
+            return int(_streak_kernel(arr.astype(np.int64)))
+        # Mark the one-day gaps, then measure the longest run of them
+        is_consec = np.diff(arr).astype("int64") == 1
+        if not is_consec.any():
+            return 1
+        padded = np.concatenate(([0], is_consec.view(np.int8), [0]))
+        changes = np.flatnonzero(np.diff(padded))
+        run_lengths = changes[1::2] - changes[::2]
+        return int(run_lengths.max()) + 1
+
+    one_day = timedelta(days=1)
+    current_streak = 0
+    max_streak = 0
+    last_date = None
+    for day in days:
+        if last_date and day == last_date + one_day:
+            current_streak += 1
+        else:
+            current_streak = 1
+        last_date = day
+        max_streak = max(max_streak, current_streak)
+    return max_streak
+
+
+def _parse_completion_days(stamps):
+    """
+    Parse completion timestamp strings into a sorted list of dates, skipping
+    any stamp without an ISO 'YYYY-MM-DD' prefix. Free-text completion times
+    can end up in history via add_completed_habit, and they should drop out
+    of the streak analysis rather than make the file unloadable.
+    :param stamps: List of completion timestamp strings.
+    :return: Sorted list of the dates that could be parsed.
+    """
+    days = []
+    for stamp in stamps:
+        try:
+            days.append(_parse_completion_date(stamp))
+        except ValueError:
+            continue
+    days.sort()
+    return days
+
+
 class EditHabits:
 
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, verbose=True):
         """
         Initialize the class with the path to the JSON file.
         If the file does not exist, create it with empty habit data.
         :param file_path: Path to the JSON file containing the habit data.
+        :param verbose: Whether to print a status line for each operation.
+            Pass False for silent bulk use; problems are always printed.
         """
         self.file_path = file_path
+        self.verbose = verbose
         self.expected_periods = ["daily", "weekly", "monthly", "yearly", "once_off"]
         # Check if the file exists; if not, create an empty habit file
         if not os.path.exists(file_path):
             self.create_empty_habits_file(file_path)
         # Load the habit data after ensuring the file exists
         self.habit_data = self.load_habit_data()
+        # An unreadable file loads as {}; start from the empty template in
+        # memory so every method can rely on the three top-level keys being
+        # present without defensive .get. The file on disk is left untouched
+        # so a decode failure never destroys the user's data.
+        if not self.habit_data:
+            self.habit_data = copy.deepcopy(_EMPTY_HABITS_TEMPLATE)
+        # A hand-edited file that loaded through the generic decoder can lack
+        # top-level or period keys; merge the missing ones in from the
+        # template so the invariant above holds for those files too
+        for key, template_value in _EMPTY_HABITS_TEMPLATE.items():
+            group = self.habit_data.setdefault(key, copy.deepcopy(template_value))
+            if key != "history":
+                for period in template_value:
+                    group.setdefault(period, [])
+        # Habit records live in memory as immutable (task, time) tuples; JSON
+        # loads them back as lists, so normalize after reading the file
+        for group_name in ("uncompleted_habits", "completed_habits"):
+            group = self.habit_data[group_name]
+            for period, habits in group.items():
+                group[period] = [tuple(habit) for habit in habits]
+        # Build the (period, task) -> index maps used for O(1) habit lookups
+        self._rebuild_indexes()
+        # Pre-sort each task's completion days so analyze never re-sorts
+        self._rebuild_completed_days()
+        # Mutations only mark the data dirty; flush() writes it out once.
+        # The atexit hook guarantees pending changes still reach the file.
+        self._dirty = False
+        atexit.register(self.flush)
 
 
     def create_empty_habits_file(self, new_file_path):
@@ -25,26 +258,12 @@ class EditHabits:
         Generate a new JSON file with empty 'uncompleted_habits', 'completed_habits', and 'history' dictionaries.
         :param new_file_path: The name or path of the new JSON file to create.
         """
-        empty_data = {
-            "uncompleted_habits": {
-                "daily": [],
-                "weekly": [],
-                "monthly": [],
-                "yearly": [],
-                "once_off": []
-            },
-            "completed_habits": {
-                "daily": [],
-                "weekly": [],
-                "monthly": [],
-                "yearly": [],
-                "once_off": []
-            },
-            "history": {}  # To store history of when habits were created and completed
-        }
-        with open(new_file_path, 'w') as new_file:
-            json.dump(empty_data, new_file, indent=4)
-        print(f"New empty habit file created: {new_file_path}")
+        # The template bytes were serialized once at import, so creating the
+        # file is a single write with no per-call serialization pass
+        with open(new_file_path, 'wb') as new_file:
+            new_file.write(_EMPTY_HABITS_JSON)
+        if self.verbose:
+            print(f"New empty habit file created: {new_file_path}")
 
 
     def load_habit_data(self):
@@ -53,24 +272,201 @@ class EditHabits:
         :return: Dictionary containing the habit data.
         """
         try:
-            with open(self.file_path, 'r') as file:
+            if _HABITS_DECODER is not None:
+                with open(self.file_path, 'rb', buffering=65536) as file:
+                    raw = file.read()
+                try:
+                    return _HABITS_DECODER.decode(raw)
+                except msgspec.ValidationError:
+                    # Valid JSON that doesn't match the schema exactly (e.g.
+                    # hand-edited history entries with keys missing) still
+                    # loads through the generic decoder rather than being
+                    # treated as an unreadable file
+                    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+            if orjson is not None:
+                with open(self.file_path, 'rb', buffering=65536) as file:
+                    return orjson.loads(file.read())
+            with open(self.file_path, 'r', buffering=65536) as file:
                 habit_data = json.load(file)
             return habit_data
         except FileNotFoundError:
             print(f"File not found: {self.file_path}")
             return {}
-        except json.JSONDecodeError:
+        except ValueError:  # Covers json, orjson and msgspec decode errors
             print(f"Error decoding JSON from file: {self.file_path}")
             return {}
 
 
+    def _rebuild_indexes(self):
+        """
+        Rebuild the (period, task) -> positions maps for uncompleted and
+        completed habits. The maps let the mutating methods find a habit with
+        one hash lookup instead of scanning the period list. Each key maps to
+        a sorted list of positions because the same name can appear several
+        times in a period — every completion of a recurring habit appends
+        another entry to its completed list. Called after loading from disk
+        and after any bulk change that appends directly.
+        """
+        self._uncompleted_idx = {}
+        for period, habits in self.habit_data.get("uncompleted_habits", {}).items():
+            for i, habit in enumerate(habits):
+                self._uncompleted_idx.setdefault((period, habit[0]), []).append(i)
+        self._completed_idx = {}
+        for period, habits in self.habit_data.get("completed_habits", {}).items():
+            for i, habit in enumerate(habits):
+                self._completed_idx.setdefault((period, habit[0]), []).append(i)
+        # Schedule keys are derived from the time strings once at ingestion
+        self._schedule_keys = {
+            (period, habit[0]): _schedule_key(period, habit[1])
+            for period, habits in self.habit_data.get("uncompleted_habits", {}).items()
+            for habit in habits
+        }
+        # Date-indexed view of the schedule, rebuilt lazily on the next query
+        self._schedule_index = None
+
+
+    def _build_schedule_index(self):
+        """
+        Build the inverted schedule index: lists of display lines bucketed by
+        the schedule key each habit matches on. Built lazily on the first
+        get_tasks_for_day call and dropped whenever a mutation touches the
+        uncompleted habits, so a run of queries (e.g. a calendar view) only
+        pays for the habit scan and string formatting once.
+        :return: The freshly built index dict.
+        """
+        uncompleted = self.habit_data["uncompleted_habits"]
+        schedule_keys = self._schedule_keys
+        index = {
+            "daily": [f"Daily: {habit[0]} at {habit[1]}" for habit in uncompleted["daily"]],
+            "by_weekday": defaultdict(list),
+            "by_dom": defaultdict(list),
+            "by_monthday": defaultdict(list),
+            "by_date": defaultdict(list),
+        }
+        for habit in uncompleted["weekly"]:
+            index["by_weekday"][schedule_keys[("weekly", habit[0])]].append(
+                f"Weekly: {habit[0]} at {habit[1]}")
+        for habit in uncompleted["monthly"]:
+            index["by_dom"][schedule_keys[("monthly", habit[0])]].append(
+                f"Monthly: {habit[0]} at {habit[1]}")
+        for habit in uncompleted["yearly"]:
+            index["by_monthday"][schedule_keys[("yearly", habit[0])]].append(
+                f"Yearly: {habit[0]} at {habit[1]}")
+        for habit in uncompleted["once_off"]:
+            index["by_date"][schedule_keys[("once_off", habit[0])]].append(
+                f"Once-off: {habit[0]} at {habit[1]}")
+        self._schedule_index = index
+        return index
+
+
+    def _rebuild_completed_days(self):
+        """
+        Rebuild the per-task sorted lists of completion days from history.
+        Keeping these sorted at insert time means analyze_habits neither
+        re-parses nor re-sorts the completion timestamps on each call.
+
+        With numpy available every timestamp across all tasks is flattened
+        into one array and parsed by numpy's C-level ISO-8601 parser in a
+        single call, then sliced back per task; otherwise each stamp goes
+        through the cached Python parser individually.
+        """
+        history = self.habit_data["history"]
+        if np is not None:
+            all_stamps = []
+            segments = []  # (task, start, end) slice bounds into all_stamps
+            for task, details in history.items():
+                start = len(all_stamps)
+                all_stamps.extend(details.get("completed", []))
+                segments.append((task, start, len(all_stamps)))
+            try:
+                days = np.array(all_stamps, dtype="datetime64[us]").astype("datetime64[D]")
+            except ValueError:
+                # A non-ISO stamp (e.g. free text typed at the CLI prompt)
+                # poisons the bulk conversion; fall back to the per-stamp
+                # path below, which skips the stamps it cannot parse
+                pass
+            else:
+                self._completed_days = {
+                    task: sorted(days[start:end].tolist())
+                    for task, start, end in segments
+                }
+                return
+        self._completed_days = {
+            task: _parse_completion_days(details.get("completed", []))
+            for task, details in history.items()
+        }
+
+
+    def _record_completion_day(self, task, stamp):
+        """
+        Insert the completion day for a task, keeping its day list sorted.
+        Stamps without an ISO 'YYYY-MM-DD' prefix (free text from the
+        add_completed_habit prompt) are skipped, matching how the load-time
+        rebuild treats them, rather than failing the mutation halfway.
+        :param task: The habit task the completion belongs to.
+        :param stamp: Timestamp string, ideally with an ISO date prefix.
+        """
+        try:
+            day = _parse_completion_date(stamp)
+        except ValueError:
+            return
+        bisect.insort(self._completed_days.setdefault(task, []), day)
+
+
+    def _reindex_period(self, index, period, habits):
+        """
+        Rebuild one period's entries in an index map after a deletion shifted
+        the positions of the habits behind it. Keys whose last occurrence was
+        deleted drop out of the map entirely.
+        :param index: The index map to update (uncompleted or completed).
+        :param period: The period whose list was modified.
+        :param habits: The habit list that was modified.
+        """
+        for key in [key for key in index if key[0] == period]:
+            del index[key]
+        for i, habit in enumerate(habits):
+            index.setdefault((period, habit[0]), []).append(i)
+
+
+    def _check_period(self, period):
+        """
+        Validate a habit period against the known set, printing the shared
+        error message here instead of duplicating it in every mutator.
+        :param period: The period name to validate.
+        :return: True if the period is valid, False otherwise.
+        """
+        if period not in _VALID_PERIODS:
+            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
+            return False
+        return True
+
+
     def save_habit_data(self):
         """
         Save the habit data dictionary to the specified JSON file.
         """
-        with open(self.file_path, 'w') as file:
-            json.dump(self.habit_data, file, indent=4)
-        print(f"Habit data saved to {self.file_path}")
+        if _HABITS_ENCODER is not None:
+            with open(self.file_path, 'wb', buffering=65536) as file:
+                file.write(msgspec.json.format(_HABITS_ENCODER.encode(self.habit_data), indent=2))
+        elif orjson is not None:
+            with open(self.file_path, 'wb', buffering=65536) as file:
+                file.write(orjson.dumps(self.habit_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.file_path, 'w', buffering=65536) as file:
+                json.dump(self.habit_data, file, indent=4)
+        if self.verbose:
+            print(f"Habit data saved to {self.file_path}")
+
+
+    def flush(self):
+        """
+        Write the habit data to disk if anything changed since the last save.
+        Mutators only mark the data dirty, so a burst of edits costs a single
+        file rewrite here instead of one full rewrite per call.
+        """
+        if self._dirty:
+            self.save_habit_data()
+            self._dirty = False
 
 
     def add_uncompleted_habit(self, period, task, time):
@@ -80,21 +476,24 @@ class EditHabits:
         :param task: The description of the habit task.
         :param time: The time format for the habit based on the period.
         """
-        if period in self.habit_data.get("uncompleted_habits", {}):
-            self.habit_data["uncompleted_habits"][period].append([task, time])
-            
+        if self._check_period(period):
+            habits = self.habit_data["uncompleted_habits"][period]
+            habits.append((task, time))
+            self._uncompleted_idx.setdefault((period, task), []).append(len(habits) - 1)
+            self._schedule_keys[(period, task)] = _schedule_key(period, time)
+            self._schedule_index = None
+
             # Log creation time in history
             if task not in self.habit_data.get("history", {}):
                 self.habit_data["history"][task] = {
-                    "created": str(datetime.now()),
+                    "created": datetime.now().isoformat(sep=' '),
                     "completed": [],
                     "removed": None  # Placeholder for removal time
                 }
             
-            self.save_habit_data()
-            print(f"Added new habit '{task}' to {period} habits.")
-        else:
-            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
+            self._dirty = True
+            if self.verbose:
+                print(f"Added new habit '{task}' to {period} habits.")
 
 
     def remove_uncompleted_habit(self, period, task):
@@ -103,27 +502,33 @@ class EditHabits:
         :param period: The period of the habit (daily, weekly, etc.).
         :param task: The description of the habit task to be removed.
         """
-        if period in self.habit_data.get("uncompleted_habits", {}):
-            for habit in self.habit_data["uncompleted_habits"][period]:
-                if habit[0] == task:
-                    self.habit_data["uncompleted_habits"][period].remove(habit)
-
-                    # Log removal time in history
-                    if task in self.habit_data.get("history", {}):
-                        self.habit_data["history"][task]["removed"] = str(datetime.now())
-                    else:
-                        self.habit_data["history"][task] = {
-                            "created": None,
-                            "completed": [],
-                            "removed": str(datetime.now())
-                        }
-                    
-                    self.save_habit_data()
+        if self._check_period(period):
+            habits = self.habit_data["uncompleted_habits"][period]
+            # One hash lookup instead of scanning the period list
+            positions = self._uncompleted_idx.get((period, task))
+            if positions:
+                # Remove the first occurrence, like the original scan did
+                del habits[positions[0]]
+                self._reindex_period(self._uncompleted_idx, period, habits)
+                if (period, task) not in self._uncompleted_idx:
+                    self._schedule_keys.pop((period, task), None)
+                self._schedule_index = None
+
+                # Log removal time in history
+                if task in self.habit_data.get("history", {}):
+                    self.habit_data["history"][task]["removed"] = datetime.now().isoformat(sep=' ')
+                else:
+                    self.habit_data["history"][task] = {
+                        "created": None,
+                        "completed": [],
+                        "removed": datetime.now().isoformat(sep=' ')
+                    }
+
+                self._dirty = True
+                if self.verbose:
                     print(f"Removed habit '{task}' from {period} habits.")
-                    return
+                return
             print(f"Habit '{task}' not found in {period} habits.")
-        else:
-            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
 
 
     def move_to_completed(self, period, task):
@@ -134,31 +539,39 @@ class EditHabits:
         :param period: The period of the habit (daily, weekly, etc.).
         :param task: The description of the habit task to be moved.
         """
-        if period in self.habit_data.get("uncompleted_habits", {}) and period in self.habit_data.get("completed_habits", {}):
-            for habit in self.habit_data["uncompleted_habits"][period]:
-                if habit[0] == task:
-                    # Add to completed habits with current timestamp
-                    completion_time = str(datetime.now())
-                    self.habit_data["completed_habits"][period].append([task, completion_time])
-                    
-                    # Log completion time in history
-                    if task in self.habit_data.get("history", {}):
-                        self.habit_data["history"][task]["completed"].append(completion_time)
-                    else:
-                        self.habit_data["history"][task] = {"created": None, "completed": [completion_time], "removed": None}
-                    
-                    # Only remove from uncompleted habits if it's a once_off task
-                    if period == "once_off":
-                        self.habit_data["uncompleted_habits"][period].remove(habit)
+        if self._check_period(period):
+            habits = self.habit_data["uncompleted_habits"][period]
+            # One hash lookup instead of scanning the period list
+            positions = self._uncompleted_idx.get((period, task))
+            if positions:
+                # Add to completed habits with current timestamp
+                completion_time = datetime.now().isoformat(sep=' ')
+                completed = self.habit_data["completed_habits"][period]
+                completed.append((task, completion_time))
+                self._completed_idx.setdefault((period, task), []).append(len(completed) - 1)
+
+                # Log completion time in history
+                if task in self.habit_data.get("history", {}):
+                    self.habit_data["history"][task]["completed"].append(completion_time)
+                else:
+                    self.habit_data["history"][task] = {"created": None, "completed": [completion_time], "removed": None}
+                self._record_completion_day(task, completion_time)
+
+                # Only remove from uncompleted habits if it's a once_off task
+                if period == "once_off":
+                    del habits[positions[0]]
+                    self._reindex_period(self._uncompleted_idx, period, habits)
+                    if (period, task) not in self._uncompleted_idx:
+                        self._schedule_keys.pop((period, task), None)
+                    self._schedule_index = None
+                    if self.verbose:
                         print(f"Removed once-off habit '{task}' from uncompleted {period} habits.")
-                    
-                    # Save updated habit data back to the file
-                    self.save_habit_data()
+
+                self._dirty = True
+                if self.verbose:
                     print(f"Marked habit '{task}' as completed in {period} habits.")
-                    return
+                return
             print(f"Habit '{task}' not found in {period} uncompleted habits.")
-        else:
-            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
 
 
     def get_tasks_for_day(self, date):
@@ -167,59 +580,48 @@ class EditHabits:
         :param date: The date in the format 'YYYY-MM-DD'.
         :return: List of tasks scheduled for that day.
         """
+        # Validate and parse by slicing the ISO string directly; this skips the
+        # strptime format machinery and the strftime calls derived from it
+        if _ISO_DATE_RE.fullmatch(date) is None:
+            print("Invalid date format. Please use 'YYYY-MM-DD'.")
+            return []
         try:
-            target_date = datetime.strptime(date, "%Y-%m-%d")
+            target_date = datetime(int(date[0:4]), int(date[5:7]), int(date[8:10]))
         except ValueError:
             print("Invalid date format. Please use 'YYYY-MM-DD'.")
             return []
 
-        tasks_for_day = []
-
-        # Daily Habits
-        daily_habits = self.habit_data.get("uncompleted_habits", {}).get("daily", [])
-        for habit in daily_habits:
-            tasks_for_day.append(f"Daily: {habit[0]} at {habit[1]}")
-
-        # Weekly Habits
-        weekly_habits = self.habit_data.get("uncompleted_habits", {}).get("weekly", [])
-        day_of_week = target_date.strftime("%A")  # e.g., 'Monday'
-        for habit in weekly_habits:
-            if day_of_week in habit[1]:
-                tasks_for_day.append(f"Weekly: {habit[0]} at {habit[1]}")
-
-        # Monthly Habits
-        monthly_habits = self.habit_data.get("uncompleted_habits", {}).get("monthly", [])
-        day_of_month = target_date.strftime("%d")  # e.g., '15'
-        for habit in monthly_habits:
-            if habit[1].startswith(day_of_month):
-                tasks_for_day.append(f"Monthly: {habit[0]} at {habit[1]}")
-
-        # Yearly Habits
-        yearly_habits = self.habit_data.get("uncompleted_habits", {}).get("yearly", [])
-        month_day = target_date.strftime("%m-%d")  # e.g., '10-15'
-        for habit in yearly_habits:
-            if habit[1].startswith(month_day):
-                tasks_for_day.append(f"Yearly: {habit[0]} at {habit[1]}")
-
-        # Once-off Habits
-        once_off_habits = self.habit_data.get("uncompleted_habits", {}).get("once_off", [])
-        for habit in once_off_habits:
-            if habit[1].startswith(date):
-                tasks_for_day.append(f"Once-off: {habit[0]} at {habit[1]}")
-
-        return tasks_for_day
+        # The inverted index buckets the formatted lines by schedule key, so
+        # answering a day is five hash lookups and a concatenation instead of
+        # a scan over every habit. It survives until the next mutation, which
+        # makes repeated queries (calendar views) O(queries + habits).
+        index = self._schedule_index
+        if index is None:
+            index = self._build_schedule_index()
+
+        return (
+            index["daily"]
+            + index["by_weekday"][target_date.weekday()]
+            + index["by_dom"][date[8:10]]
+            + index["by_monthday"][date[5:10]]
+            + index["by_date"][date]
+        )
 
     def list_all_habits(self):
         """
         Return a list of all tracked habits (completed and uncompleted).
         """
         all_habits = []
-        for period, habits in self.habit_data.get("uncompleted_habits", {}).items():
-            for habit in habits:
-                all_habits.append(f"Uncompleted {period.capitalize()}: {habit[0]} at {habit[1]}")
-        for period, habits in self.habit_data.get("completed_habits", {}).items():
-            for habit in habits:
-                all_habits.append(f"Completed {period.capitalize()}: {habit[0]} at {habit[1]}")
+        append = all_habits.append
+        for period, habits in self.habit_data["uncompleted_habits"].items():
+            # Build the period prefix once instead of per habit
+            prefix = f"Uncompleted {period.capitalize()}: "
+            for task, habit_time in habits:
+                append(prefix + task + " at " + habit_time)
+        for period, habits in self.habit_data["completed_habits"].items():
+            prefix = f"Completed {period.capitalize()}: "
+            for task, habit_time in habits:
+                append(prefix + task + " at " + habit_time)
         return all_habits
 
 
@@ -252,51 +654,78 @@ class EditHabits:
             ]
         }
         
+        # One shared creation timestamp for the whole setup run; the habits
+        # are created together, so per-iteration now() calls only produced
+        # microsecond jitter between entries that should agree anyway
+        now = datetime.now()
+        now_str = now.isoformat(sep=' ')
+
         # Add predefined habits to uncompleted habits with history tracking
         for period, habits in predefined_habits.items():
             for habit in habits:
-                task, time = habit
-                self.habit_data["uncompleted_habits"][period].append([task, time])
+                task, habit_time = habit
+                self.habit_data["uncompleted_habits"][period].append((task, habit_time))
                 
                 # Log creation time in history
                 if task not in self.habit_data.get("history", {}):
                     self.habit_data["history"][task] = {
-                        "created": str(datetime.now()),  # Log the current time as the creation time
+                        "created": now_str,  # Log the shared setup time as the creation time
                         "completed": [],
                         "removed": None  # Placeholder for removal time if needed
                     }
-        
+
+        # The loop above appends directly, so refresh the lookup indexes
+        self._rebuild_indexes()
+
         # Simulate example tracking data for a period of 4 weeks
-        current_date = datetime.now().date()
-        
+        current_date = now.date()
+
+        # Completion times used below, built once with the time constructor
+        # instead of re-parsing the same "HH:MM" strings inside the loops
+        times_of_day = {
+            "07:00": time(7, 0),
+            "09:00": time(9, 0),
+            "10:00": time(10, 0),
+            "11:00": time(11, 0),
+            "20:00": time(20, 0)
+        }
+        stamp_format = "%Y-%m-%d %H:%M:%S.%f"
+
         for task, details in self.habit_data["history"].items():
             # Generate completion dates for each habit
             if "Morning Exercise" in task or "Evening Reading" in task:
                 # Simulate daily habits
+                time_of_day = times_of_day["07:00" if "Morning Exercise" in task else "20:00"]
                 for i in range(28):  # 4 weeks of daily data
                     completion_date = current_date - timedelta(days=(28 - i))
-                    completion_time = datetime.combine(completion_date, datetime.strptime("07:00" if "Morning Exercise" in task else "20:00", "%H:%M").time())
-                    details["completed"].append(completion_time.strftime("%Y-%m-%d %H:%M:%S.%f"))
+                    completion_time = datetime.combine(completion_date, time_of_day)
+                    details["completed"].append(completion_time.strftime(stamp_format))
 
             elif "Weekly Meeting" in task or "Grocery Shopping" in task:
                 # Simulate weekly habits (4 times)
+                time_of_day = times_of_day["09:00" if "Weekly Meeting" in task else "10:00"]
                 for i in range(4):
                     completion_date = current_date - timedelta(days=(4 - i) * 7)  # Once a week for 4 weeks
-                    completion_time = datetime.combine(completion_date, datetime.strptime("09:00" if "Weekly Meeting" in task else "10:00", "%H:%M").time())
-                    details["completed"].append(completion_time.strftime("%Y-%m-%d %H:%M:%S.%f"))
+                    completion_time = datetime.combine(completion_date, time_of_day)
+                    details["completed"].append(completion_time.strftime(stamp_format))
 
             elif "Pay Rent" in task or "Team Meeting" in task:
                 # Simulate monthly habits (1 time in the last 4 weeks)
                 completion_date = current_date - timedelta(days=15)  # 15 days ago
-                completion_time = datetime.combine(completion_date, datetime.strptime("09:00" if "Pay Rent" in task else "11:00", "%H:%M").time())
-                details["completed"].append(completion_time.strftime("%Y-%m-%d %H:%M:%S.%f"))
+                completion_time = datetime.combine(completion_date, times_of_day["09:00" if "Pay Rent" in task else "11:00"])
+                details["completed"].append(completion_time.strftime(stamp_format))
 
             elif "Annual Review" in task or "Doctor Checkup" in task:
                 # Simulate yearly habits (not completed in the last 4 weeks)
                 details["completed"].append("2023-12-31 10:00:00.000000")
 
-        self.save_habit_data()
-        print("Predefined habits and example tracking data have been set up for daily, weekly, monthly, yearly, and once_off tasks.")
+        # The simulation above appends to history directly, so refresh the
+        # sorted completion-day cache
+        self._rebuild_completed_days()
+
+        self._dirty = True
+        if self.verbose:
+            print("Predefined habits and example tracking data have been set up for daily, weekly, monthly, yearly, and once_off tasks.")
 
 
 
@@ -307,9 +736,11 @@ class EditHabits:
         :param task: The description of the habit task.
         :param completion_time: The time the task was completed, format 'YYYY-MM-DD HH:MM'.
         """
-        if period in self.habit_data.get("completed_habits", {}):
-            self.habit_data["completed_habits"][period].append([task, completion_time])
-            
+        if self._check_period(period):
+            completed = self.habit_data["completed_habits"][period]
+            completed.append((task, completion_time))
+            self._completed_idx.setdefault((period, task), []).append(len(completed) - 1)
+
             # Log the completion time in history
             if task in self.habit_data.get("history", {}):
                 self.habit_data["history"][task]["completed"].append(completion_time)
@@ -319,11 +750,11 @@ class EditHabits:
                     "completed": [completion_time],
                     "removed": None
                 }
-            
-            self.save_habit_data()
-            print(f"Manually added completed habit '{task}' to {period} habits.")
-        else:
-            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
+            self._record_completion_day(task, completion_time)
+
+            self._dirty = True
+            if self.verbose:
+                print(f"Manually added completed habit '{task}' to {period} habits.")
 
 
     def remove_completed_habit(self, period, task):
@@ -332,27 +763,30 @@ class EditHabits:
         :param period: The period of the habit (daily, weekly, etc.).
         :param task: The description of the habit task to be removed.
         """
-        if period in self.habit_data.get("completed_habits", {}):
-            for habit in self.habit_data["completed_habits"][period]:
-                if habit[0] == task:
-                    self.habit_data["completed_habits"][period].remove(habit)
-                    
-                    # Log the removal time in history
-                    if task in self.habit_data.get("history", {}):
-                        self.habit_data["history"][task]["removed"] = str(datetime.now())
-                    else:
-                        self.habit_data["history"][task] = {
-                            "created": None,
-                            "completed": [],
-                            "removed": str(datetime.now())
-                        }
-                    
-                    self.save_habit_data()
+        if self._check_period(period):
+            habits = self.habit_data["completed_habits"][period]
+            # One hash lookup instead of scanning the period list
+            positions = self._completed_idx.get((period, task))
+            if positions:
+                # Remove the first occurrence, like the original scan did
+                del habits[positions[0]]
+                self._reindex_period(self._completed_idx, period, habits)
+
+                # Log the removal time in history
+                if task in self.habit_data.get("history", {}):
+                    self.habit_data["history"][task]["removed"] = datetime.now().isoformat(sep=' ')
+                else:
+                    self.habit_data["history"][task] = {
+                        "created": None,
+                        "completed": [],
+                        "removed": datetime.now().isoformat(sep=' ')
+                    }
+
+                self._dirty = True
+                if self.verbose:
                     print(f"Removed completed habit '{task}' from {period} habits.")
-                    return
+                return
             print(f"Completed habit '{task}' not found in {period} habits.")
-        else:
-            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
 
 
     def edit_uncompleted_habit(self, period, old_task, new_task=None, new_time=None):
@@ -363,19 +797,34 @@ class EditHabits:
         :param new_task: The new task description (optional).
         :param new_time: The new time for the habit (optional).
         """
-        if period in self.habit_data.get("uncompleted_habits", {}):
-            for habit in self.habit_data["uncompleted_habits"][period]:
-                if habit[0] == old_task:
-                    if new_task:
-                        habit[0] = new_task
-                    if new_time:
-                        habit[1] = new_time
-                    self.save_habit_data()
+        if self._check_period(period):
+            # One hash lookup instead of scanning the period list
+            positions = self._uncompleted_idx.get((period, old_task))
+            if positions:
+                habits = self.habit_data["uncompleted_habits"][period]
+                # Edit the first occurrence, like the original scan did
+                i = positions[0]
+                task, habit_time = habits[i]
+                if new_task:
+                    task = new_task
+                    # Re-key this occurrence under the new task name without
+                    # clobbering other habits that share either name
+                    positions.remove(i)
+                    if not positions:
+                        del self._uncompleted_idx[(period, old_task)]
+                        self._schedule_keys.pop((period, old_task), None)
+                    bisect.insort(self._uncompleted_idx.setdefault((period, new_task), []), i)
+                if new_time:
+                    habit_time = new_time
+                # Habit records are immutable tuples, so replace the entry
+                habits[i] = (task, habit_time)
+                self._schedule_keys[(period, task)] = _schedule_key(period, habit_time)
+                self._schedule_index = None
+                self._dirty = True
+                if self.verbose:
                     print(f"Edited habit '{old_task}' in {period} habits.")
-                    return
+                return
             print(f"Habit '{old_task}' not found in {period} habits.")
-        else:
-            print("Invalid period! Please choose from daily, weekly, monthly, yearly, once_off.")
 
 
     def analyze_habits(self):
@@ -401,26 +850,9 @@ class EditHabits:
         today = datetime.now().date()
 
         # Analyzing habit history for streaks and challenges
-        for task, details in self.habit_data.get("history", {}).items():
-            # Calculate streaks based on completion dates
-            completed_dates = [
-                datetime.strptime(date, "%Y-%m-%d %H:%M:%S.%f").date()
-                for date in details.get("completed", [])
-            ]
-            completed_dates.sort()  # Sort the dates to analyze streaks
-
-            # Track habit streaks
-            current_streak = 0
-            max_streak = 0
-            last_date = None
-
-            for date in completed_dates:
-                if last_date and date == last_date + timedelta(days=1):
-                    current_streak += 1
-                else:
-                    current_streak = 1
-                last_date = date
-                max_streak = max(max_streak, current_streak)
+        for task, details in self.habit_data["history"].items():
+            # The completion days are kept parsed and sorted at insert time
+            max_streak = _streak_from_sorted_days(self._completed_days.get(task, ()))
 
             # Update the habit streaks dictionary
             habit_streaks[task] = max_streak
@@ -439,7 +871,7 @@ class EditHabits:
                 analysis["most_challenging"] = {"habit": task, "missed_count": missed_count}
 
         # Identify current daily habits that need to be completed (today's uncompleted daily habits)
-        current_daily_habits = self.habit_data.get("uncompleted_habits", {}).get("daily", [])
+        current_daily_habits = self.habit_data["uncompleted_habits"]["daily"]
         for habit in current_daily_habits:
             analysis["current_daily_habits"].append(f"{habit[0]} at {habit[1]}")
 
@@ -469,24 +901,8 @@ def main():
     # Create the habits.json file if it does not exist
     if not os.path.exists(file_path):
         try:
-            with open(file_path, 'w') as file:
-                json.dump({
-                    "uncompleted_habits": {
-                        "daily": [],
-                        "weekly": [],
-                        "monthly": [],
-                        "yearly": [],
-                        "once_off": []
-                    },
-                    "completed_habits": {
-                        "daily": [],
-                        "weekly": [],
-                        "monthly": [],
-                        "yearly": [],
-                        "once_off": []
-                    },
-                    "history": {}
-                }, file, indent=4)
+            with open(file_path, 'wb') as file:
+                file.write(_EMPTY_HABITS_JSON)
             print(f"New habits JSON file created at {file_path}")
         except Exception as e:
             print(f"Error creating file at '{file_path}': {e}")
@@ -571,6 +987,8 @@ def main():
                 print(f"File '{file_path}' deleted successfully. Exiting now.")
             else:
                 print(f"File '{file_path}' not found for deletion.")
+            # Drop pending changes so the atexit flush does not recreate the file
+            habit_manager._dirty = False
             return  # Exit the program after cleanup
 
         elif command == '10':